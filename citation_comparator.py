@@ -9,6 +9,11 @@ Requirements:
 - pyzotero: pip install pyzotero
 - requests: pip install requests
 - beautifulsoup4: pip install beautifulsoup4
+- lxml: pip install lxml
+- aiohttp: pip install aiohttp (optional, fetches Wikiversity pages concurrently)
+- rapidfuzz: pip install rapidfuzz (optional, fast native title matching)
+- numpy: pip install numpy
+- numba: pip install numba (optional, compiles the title signature builder)
 - python-dotenv: pip install python-dotenv (optional, for environment variables)
 
 Setup:
@@ -18,14 +23,125 @@ Setup:
 """
 
 import re
+import asyncio
+import threading
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 from pyzotero import zotero
 import json
-from urllib.parse import urljoin, urlparse
+import pickle
+from urllib.parse import urljoin, urlparse, parse_qs, quote, unquote
 from difflib import SequenceMatcher
 import os
-from typing import List, Dict, Set, Tuple
+from collections import deque
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import List, Dict, Set, Tuple, Optional
+import numpy as np
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:
+    fuzz = process = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Patterns used in the per-page and per-citation loops, compiled once
+_CITE_RE = re.compile(r'\{\{cite[^}]+\}\}', re.IGNORECASE | re.DOTALL)  # {{cite web}}, {{cite journal}}, ...
+_URL_RE = re.compile(r'https?://[^\s<>"{}|\\^`\[\]]+')
+_YEAR_RE = re.compile(r'\b(?:19|20)\d{2}\b')
+_REF_CLS_RE = re.compile(r'references|bibliography')
+_REF_TAG_RE = re.compile(r'<ref(?:\s[^>]*)?(?<!/)>(.*?)</ref>', re.IGNORECASE | re.DOTALL)  # <ref>...</ref> in wikitext
+
+# Wikitext markup, stripped from <ref> bodies so they read like rendered text
+_EXT_LINK_RE = re.compile(r'\[(?:https?:)?//[^\s\]]+\s+([^\]]*)\]')  # [url text] -> text
+_WIKI_LINK_RE = re.compile(r'\[\[(?:[^|\]]*\|)?([^\]]*)\]\]')  # [[page|text]] -> text
+_WIKI_QUOTES_RE = re.compile(r"'{2,}")  # ''italic'', '''bold'''
+
+# Only reference sections and lists are built into the parse tree
+_REF_STRAINER = SoupStrainer(['div', 'section', 'ol'], class_=_REF_CLS_RE)
+
+# Any non-word, non-space character (punctuation and symbols such as the '↑'
+# backlink MediaWiki puts before references), replaced by a space in normalize_title
+_PUNCT_RE = re.compile(r'[^\w\s]')
+
+# Wikimedia asks API clients to identify themselves
+_USER_AGENT = 'wikiversity-zotero-comparator (https://github.com/suny-poly-aix/wikiversity-zotero-comparator)'
+
+# Maximum page size accepted by the Zotero web API
+_ZOTERO_PAGE_SIZE = 100
+
+# Number of Zotero pages fetched ahead of the one being indexed
+_ZOTERO_PAGE_WORKERS = 4
+
+# Zotero titles are indexed by their words of at least this many characters
+_BLOCK_TOKEN_LEN = 4
+
+# Length of the character n-grams used to pre-filter title candidates
+_NGRAM_LEN = 4
+
+
+@lru_cache(maxsize=8192)
+def _normalize_title(title: str) -> str:
+    # Lowercase, turn punctuation into spaces and collapse whitespace
+    return ' '.join(_PUNCT_RE.sub(' ', title.lower()).split())
+
+
+def _ngram_signature_py(title, n):
+    # Plain-int equivalent of _ngram_signature for when numba is missing. Only
+    # h % 64 picks the bit, so h is kept modulo 64 and rolled along the title
+    codes = [ord(c) for c in title]
+    h = 0
+    for code in codes[:n]:
+        h = (h * 31 + code) & 63
+    signature = 1 << h
+    drop = pow(31, n, 64)
+    for old, new in zip(codes, codes[n:]):
+        h = (h * 31 - old * drop + new) & 63
+        signature |= 1 << h
+    return signature
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _ngram_signature(codes, n):
+        # Hash every n-code-point window into one bit of a 64-bit mask; titles
+        # shorter than n are hashed whole
+        signature = np.uint64(0)
+        for start in range(max(len(codes) - n + 1, 1)):
+            h = np.uint64(0)
+            for i in range(start, min(start + n, len(codes))):
+                h = h * np.uint64(31) + np.uint64(codes[i])
+            signature |= np.uint64(1) << (h % np.uint64(64))
+        return signature
+
+
+def _title_signature(title: str) -> int:
+    if njit is None:
+        return _ngram_signature_py(title, _NGRAM_LEN)
+    codes = np.frombuffer(title.encode('utf-32-le'), dtype=np.uint32)
+    return _ngram_signature(codes, _NGRAM_LEN)
+
+
+@lru_cache(maxsize=16384)
+def _similarity(str1: str, str2: str) -> float:
+    if fuzz is not None:
+        return fuzz.ratio(str1, str2) / 100.0
+    # autojunk must stay off: on strings over 200 characters it treats
+    # frequent characters as junk and returns misleadingly low ratios
+    return SequenceMatcher(None, str1, str2, autojunk=False).ratio()
+
 
 class WikiversityZoteroComparator:
     def __init__(self, zotero_user_id: str, zotero_api_key: str, library_type: str = 'user'):
@@ -38,21 +154,175 @@ class WikiversityZoteroComparator:
             library_type: 'user' or 'group' (default: 'user')
         """
         self.zot = zotero.Zotero(zotero_user_id, library_type, zotero_api_key)
-        self.zotero_items = []
+        # pyzotero keeps per-request state on the client, so each page-fetching
+        # thread gets its own
+        self._zot_credentials = (zotero_user_id, library_type, zotero_api_key)
+        self._zot_local = threading.local()
         self.wikiversity_citations = []
+        self._reset_zotero_index()
+        
+        # Shared HTTP session so keep-alive connections are reused between pages
+        self._http = requests.Session()
+        self._http.headers['User-Agent'] = _USER_AGENT
+        retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retries)
+        self._http.mount('https://', adapter)
+        self._http.mount('http://', adapter)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """Close the pooled HTTP connections."""
+        self._http.close()
+        
+    def load_zotero_library(self, cache_file: Optional[str] = None) -> int:
+        """
+        Load all items from Zotero library.
         
-    def load_zotero_library(self) -> List[Dict]:
-        """Load all items from Zotero library."""
+        Pages are downloaded in the background and indexed as they arrive.
+        Only each item's key, title and URL are kept.
+        
+        Args:
+            cache_file: Optional path of a local cache of the library. When the
+                library version on the server matches the cache nothing is
+                downloaded; otherwise only the items changed since the cached
+                version are fetched.
+            
+        Returns:
+            Number of items loaded
+        """
         print("Loading Zotero library...")
         try:
-            # Get all items from library
-            items = self.zot.everything(self.zot.items())
-            self.zotero_items = items
-            print(f"Loaded {len(items)} items from Zotero library")
-            return items
+            cache = self._read_zotero_cache(cache_file) if cache_file else None
+            version = self.zot.last_modified_version() if cache_file else None
+            
+            if cache and cache['version'] == version:
+                self._load_zotero_items(zip(cache['ids'], cache['titles'], cache['urls']))
+                print(f"Loaded {len(self._zot_ids)} items from Zotero cache (library unchanged)")
+            elif cache:
+                changed = self._update_zotero_items(cache)
+                print(f"Loaded {len(self._zot_ids)} items from Zotero cache ({changed} changed since last run)")
+            else:
+                self._reset_zotero_index()
+                for page in self._iter_zotero_pages():
+                    for item in page:
+                        self._add_zotero_item(*self._zotero_item_fields(item))
+                print(f"Loaded {len(self._zot_ids)} items from Zotero library")
         except Exception as e:
             print(f"Error loading Zotero library: {e}")
-            return []
+            return 0
+        
+        if cache_file:
+            try:
+                self._write_zotero_cache(cache_file, version)
+            except Exception as e:
+                # The library is loaded either way; only the next run loses the cache
+                print(f"Warning: could not write Zotero cache {cache_file}: {e}")
+        return len(self._zot_ids)
+    
+    def _read_zotero_cache(self, cache_file: str) -> Optional[Dict]:
+        """Read the library cache, ignoring missing, unreadable or foreign caches."""
+        try:
+            with open(cache_file, 'rb') as f:
+                cache = pickle.load(f)
+        except Exception:
+            # A truncated or stale pickle can raise almost anything (AttributeError,
+            # ImportError, ValueError, ...); fall back to a full load
+            return None
+        
+        if not isinstance(cache, dict) or cache.get('library') != self._zot_credentials[:2]:
+            return None
+        if not isinstance(cache.get('version'), int):
+            return None
+        columns = [cache.get(key) for key in ('ids', 'titles', 'urls')]
+        if not all(isinstance(column, list) for column in columns):
+            return None
+        if len({len(column) for column in columns}) != 1:
+            return None
+        return cache
+    
+    def _write_zotero_cache(self, cache_file: str, version: int):
+        """Save the loaded library arrays with the library version they reflect."""
+        cache = {
+            'library': self._zot_credentials[:2],
+            'version': version,
+            'ids': self._zot_ids,
+            'titles': self._zot_titles,
+            'urls': self._zot_urls
+        }
+        with open(cache_file, 'wb') as f:
+            pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+    
+    def _update_zotero_items(self, cache: Dict) -> int:
+        """Apply the changes made since the cached version and load the result; returns the change count."""
+        items = {key: (title, url) for key, title, url in zip(cache['ids'], cache['titles'], cache['urls'])}
+        
+        # Trashed items are left out of /items unless asked for, and deleted()
+        # only lists permanent deletions, so request them explicitly
+        changed = self.zot.everything(self.zot.items(since=cache['version'], includeTrashed=1))
+        for item in changed:
+            key, title, url = self._zotero_item_fields(item)
+            if item.get('data', {}).get('deleted'):
+                items.pop(key, None)
+            else:
+                items[key] = (title, url)
+        
+        deleted = self.zot.deleted(since=cache['version']).get('items', [])
+        for key in deleted:
+            items.pop(key, None)
+        
+        self._load_zotero_items((key, title, url) for key, (title, url) in items.items())
+        return len(changed) + len(deleted)
+    
+    def _load_zotero_items(self, items):
+        """Replace the loaded library with (key, title, url) triples."""
+        self._reset_zotero_index()
+        for key, title, url in items:
+            self._add_zotero_item(key, title, url)
+    
+    @staticmethod
+    def _zotero_item_fields(item: Dict) -> Tuple[str, str, str]:
+        """Extract (key, title, url) from a Zotero API item."""
+        item_data = item.get('data', {})
+        return item.get('key', item_data.get('key', '')), item_data.get('title', ''), item_data.get('url', '')
+    
+    def _zotero_client(self):
+        """Return this thread's Zotero client."""
+        client = getattr(self._zot_local, 'client', None)
+        if client is None:
+            client = zotero.Zotero(*self._zot_credentials)
+            self._zot_local.client = client
+        return client
+    
+    def _fetch_zotero_page(self, start: int) -> List[Dict]:
+        """Fetch one page of library items."""
+        return self._zotero_client().items(start=start, limit=_ZOTERO_PAGE_SIZE)
+    
+    def _iter_zotero_pages(self):
+        """Yield pages of library items in order while later pages are fetched concurrently."""
+        total = self.zot.count_items()
+        
+        starts = iter(range(0, total, _ZOTERO_PAGE_SIZE))
+        pool = ThreadPoolExecutor(max_workers=_ZOTERO_PAGE_WORKERS)
+        try:
+            # Keep only a small window of pages in flight; a consumed page's
+            # future is dropped so its raw items can be freed
+            pending = deque(pool.submit(self._fetch_zotero_page, start)
+                            for start in islice(starts, _ZOTERO_PAGE_WORKERS))
+            while pending:
+                future = pending.popleft()
+                for start in islice(starts, 1):
+                    pending.append(pool.submit(self._fetch_zotero_page, start))
+                page = future.result()
+                del future
+                yield page
+        finally:
+            # On a failed page, don't wait for the remaining queued pages
+            pool.shutdown(wait=False, cancel_futures=True)
     
     def extract_wikiversity_citations(self, wikiversity_urls: List[str]) -> List[Dict]:
         """
@@ -65,33 +335,177 @@ class WikiversityZoteroComparator:
             List of citation dictionaries
         """
         all_citations = []
+        pages = [(url, body) for url, body in self._fetch_pages(wikiversity_urls) if body is not None]
         
-        for url in wikiversity_urls:
+        for url, _ in pages:
             print(f"Processing Wikiversity page: {url}")
-            citations = self._parse_wikiversity_page(url)
+        
+        # Parsing is CPU-bound, so spread several pages over worker processes
+        if len(pages) > 1:
+            with ProcessPoolExecutor(max_workers=min(len(pages), os.cpu_count() or 1)) as pool:
+                page_citations = list(pool.map(_parse_page_worker, pages))
+        else:
+            page_citations = [self._parse_page(body, url) for url, body in pages]
+        
+        for citations in page_citations:
             all_citations.extend(citations)
         
-        self.wikiversity_citations = all_citations
-        print(f"Found {len(all_citations)} citations across all Wikiversity pages")
-        return all_citations
+        unique_citations = self._deduplicate_citations(all_citations)
+        self.wikiversity_citations = unique_citations
+        print(f"Found {len(all_citations)} citations across all Wikiversity pages "
+              f"({len(unique_citations)} unique)")
+        return unique_citations
+    
+    def _deduplicate_citations(self, citations: List[Dict]) -> List[Dict]:
+        """
+        Collapse citations of the same source into one record.
+        
+        Citations are keyed by normalized title and URL (or by their raw text
+        when they have neither). The first occurrence is kept, and the other
+        pages citing it are listed in its 'duplicates_of'.
+        """
+        seen = {}
+        
+        for citation in citations:
+            title = self.normalize_title(citation.get('title', ''))
+            url = citation.get('url', '')
+            key = (title, url, '' if title or url else citation.get('raw_text', ''))
+            
+            kept = seen.get(key)
+            if kept is None:
+                seen[key] = citation
+                continue
+            
+            source_url = citation.get('source_url')
+            duplicates_of = kept.get('duplicates_of', [])
+            if source_url and source_url != kept.get('source_url') and source_url not in duplicates_of:
+                kept['duplicates_of'] = duplicates_of + [source_url]
+        
+        return list(seen.values())
+    
+    @staticmethod
+    def _wiki_api_url(url: str) -> Optional[str]:
+        """Return the MediaWiki API URL for a Wikiversity page's wikitext, or None for other URLs."""
+        parsed = urlparse(url)
+        host = parsed.hostname or ''
+        if host != 'wikiversity.org' and not host.endswith('.wikiversity.org'):
+            return None
+        
+        api_url = f"{parsed.scheme or 'https'}://{parsed.netloc}/w/api.php?action=parse&prop=wikitext&format=json"
+        query = parse_qs(parsed.query)
+        
+        # A specific revision was requested; parse takes either oldid or page
+        oldid = query.get('oldid', [''])[0]
+        if oldid:
+            return f"{api_url}&oldid={quote(oldid)}"
+        
+        if parsed.path.startswith('/wiki/'):
+            title = unquote(parsed.path[len('/wiki/'):])
+        else:
+            title = query.get('title', [''])[0]
+        if not title:
+            return None
+        
+        return f"{api_url}&page={quote(title)}&redirects=1"
     
-    def _parse_wikiversity_page(self, url: str) -> List[Dict]:
-        """Parse a single Wikiversity page for citations."""
+    def _fetch_pages(self, urls: List[str]) -> List[Tuple[str, Optional[bytes]]]:
+        """
+        Fetch all pages, concurrently when aiohttp is available.
+        
+        Wikiversity pages are fetched as wikitext through the MediaWiki API;
+        any other URL is fetched as HTML.
+        """
+        if aiohttp is not None:
+            return asyncio.run(self._fetch_all(urls))
+        return [(url, self._fetch_page(url)) for url in urls]
+    
+    async def _fetch_all(self, urls: List[str]) -> List[Tuple[str, Optional[bytes]]]:
+        """Fetch all pages over one aiohttp session and return (url, body) pairs."""
+        connector = aiohttp.TCPConnector(limit=20)
+        async with aiohttp.ClientSession(connector=connector, headers={'User-Agent': _USER_AGENT}) as session:
+            tasks = [self._fetch_page_async(session, url) for url in urls]
+            bodies = await asyncio.gather(*tasks)
+        return list(zip(urls, bodies))
+    
+    async def _fetch_page_async(self, session, url: str) -> Optional[bytes]:
+        """Fetch a single page body; returns None on failure."""
+        try:
+            async with session.get(self._wiki_api_url(url) or url) as response:
+                response.raise_for_status()
+                return await response.read()
+        except Exception as e:
+            print(f"Error fetching {url}: {e}")
+            return None
+    
+    def _fetch_page(self, url: str) -> Optional[bytes]:
+        """Fetch a single page body over the pooled session; returns None on failure."""
         try:
-            response = requests.get(url)
+            response = self._http.get(self._wiki_api_url(url) or url, timeout=(5, 30))
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
+            return response.content
+        except Exception as e:
+            print(f"Error fetching {url}: {e}")
+            return None
+    
+    @classmethod
+    def _parse_page(cls, body: bytes, url: str) -> List[Dict]:
+        """Parse a fetched page body, as API wikitext or as HTML depending on its URL."""
+        if cls._wiki_api_url(url):
+            return cls._parse_wikitext_response(body, url)
+        return cls._parse_html(body, url)
+    
+    @classmethod
+    def _parse_wikitext_response(cls, body: bytes, url: str) -> List[Dict]:
+        """Parse a MediaWiki action=parse API response for citations."""
+        try:
+            data = json.loads(body)
+            if 'error' in data:
+                print(f"Error parsing {url}: {data['error'].get('info', data['error'])}")
+                return []
             
-            citations = []
+            wikitext = data['parse']['wikitext']['*']
+            
+            # Cite templates appear verbatim in wikitext
+            citations = cls._extract_cite_templates(wikitext, url)
+            
+            # Also pick up <ref> contents written as plain text
+            for ref_text in _REF_TAG_RE.findall(wikitext):
+                ref_text = ref_text.strip()
+                if len(ref_text) > 20 and not _CITE_RE.search(ref_text):  # Filter out very short entries
+                    citation_info = cls._parse_citation_text(cls._strip_wiki_markup(ref_text), url)
+                    if citation_info:
+                        # Labelled links lose their URL when stripped, so take it from the markup
+                        if not citation_info['url']:
+                            urls = _URL_RE.findall(ref_text)
+                            if urls:
+                                citation_info['url'] = urls[0]
+                        citations.append(citation_info)
             
-            # Look for reference sections
-            ref_sections = soup.find_all(['div', 'section'], class_=re.compile(r'references|bibliography'))
+            return citations
+            
+        except Exception as e:
+            print(f"Error parsing {url}: {e}")
+            return []
+    
+    @staticmethod
+    def _strip_wiki_markup(text: str) -> str:
+        """Reduce links and quote formatting in wikitext to their displayed text."""
+        text = _EXT_LINK_RE.sub(r'\1', text)
+        text = _WIKI_LINK_RE.sub(r'\1', text)
+        return _WIKI_QUOTES_RE.sub('', text)
+    
+    @classmethod
+    def _parse_html(cls, body: bytes, url: str) -> List[Dict]:
+        """Parse an already-fetched Wikiversity page for citations."""
+        try:
+            soup = BeautifulSoup(body, 'lxml', parse_only=_REF_STRAINER)
             
-            # Also look for <references> tags and reference lists
-            ref_tags = soup.find_all('references')
-            ref_lists = soup.find_all('ol', class_='references')
+            citations = []
             
-            all_ref_elements = ref_sections + ref_tags + ref_lists
+            # The strainer keeps only reference sections and lists
+            # (<ol class="references">), so each top-level element is one
+            # reference block; nested lists are not visited twice
+            all_ref_elements = [element for element in soup.contents if isinstance(element, Tag)]
             
             for ref_element in all_ref_elements:
                 # Extract citation text from various formats
@@ -100,12 +514,14 @@ class WikiversityZoteroComparator:
                 for item in ref_items:
                     citation_text = item.get_text(strip=True)
                     if citation_text and len(citation_text) > 20:  # Filter out very short entries
-                        citation_info = self._parse_citation_text(citation_text, url)
+                        citation_info = cls._parse_citation_text(citation_text, url)
                         if citation_info:
                             citations.append(citation_info)
             
-            # Also look for inline citations in {{cite}} format
-            cite_templates = self._extract_cite_templates(str(soup))
+            # Also look for inline citations in {{cite}} format, in the page
+            # source itself rather than a re-serialized (and strained) soup
+            page_text = body.decode(soup.original_encoding or 'utf-8', errors='replace')
+            cite_templates = cls._extract_cite_templates(page_text, url)
             citations.extend(cite_templates)
             
             return citations
@@ -114,22 +530,22 @@ class WikiversityZoteroComparator:
             print(f"Error parsing {url}: {e}")
             return []
     
-    def _extract_cite_templates(self, page_content: str) -> List[Dict]:
+    @classmethod
+    def _extract_cite_templates(cls, page_content: str, source_url: str) -> List[Dict]:
         """Extract citations from MediaWiki cite templates."""
         citations = []
         
-        # Pattern to match {{cite web}}, {{cite journal}}, etc.
-        cite_pattern = r'\{\{cite[^}]+\}\}'
-        matches = re.findall(cite_pattern, page_content, re.IGNORECASE | re.DOTALL)
+        matches = _CITE_RE.findall(page_content)
         
         for match in matches:
-            citation_info = self._parse_cite_template(match)
+            citation_info = cls._parse_cite_template(match, source_url)
             if citation_info:
                 citations.append(citation_info)
         
         return citations
     
-    def _parse_cite_template(self, template: str) -> Dict:
+    @staticmethod
+    def _parse_cite_template(template: str, source_url: str) -> Dict:
         """Parse a MediaWiki cite template."""
         # Extract key-value pairs from the template
         template = template.strip('{}')
@@ -146,7 +562,8 @@ class WikiversityZoteroComparator:
             'url': '',
             'date': '',
             'journal': '',
-            'raw_text': template
+            'raw_text': template,
+            'source_url': source_url
         }
         
         for part in parts[1:]:
@@ -171,7 +588,8 @@ class WikiversityZoteroComparator:
         
         return citation if citation['title'] else None
     
-    def _parse_citation_text(self, text: str, source_url: str) -> Dict:
+    @staticmethod
+    def _parse_citation_text(text: str, source_url: str) -> Dict:
         """Parse plain text citation into structured format."""
         # Basic citation parsing - this can be enhanced based on your needs
         citation = {
@@ -185,14 +603,12 @@ class WikiversityZoteroComparator:
         }
         
         # Try to extract URLs
-        url_pattern = r'https?://[^\s<>"{}|\\^`\[\]]+'
-        urls = re.findall(url_pattern, text)
+        urls = _URL_RE.findall(text)
         if urls:
             citation['url'] = urls[0]
         
         # Try to extract years
-        year_pattern = r'\b(19|20)\d{2}\b'
-        years = re.findall(year_pattern, text)
+        years = _YEAR_RE.findall(text)
         if years:
             citation['date'] = years[0]
         
@@ -206,16 +622,110 @@ class WikiversityZoteroComparator:
     
     def normalize_title(self, title: str) -> str:
         """Normalize title for comparison."""
-        if not title:
-            return ""
-        # Remove punctuation, convert to lowercase, remove extra spaces
-        normalized = re.sub(r'[^\w\s]', '', title.lower())
-        normalized = ' '.join(normalized.split())
-        return normalized
+        return _normalize_title(title) if title else ""
     
     def similarity_score(self, str1: str, str2: str) -> float:
         """Calculate similarity between two strings."""
-        return SequenceMatcher(None, str1, str2).ratio()
+        return _similarity(str1, str2)
+    
+    @staticmethod
+    def _url_key(url: str) -> str:
+        """Reduce a URL to host, path and query so trivial variants compare equal."""
+        parsed = urlparse(url.strip())
+        key = parsed.netloc.lower().removeprefix('www.') + parsed.path.rstrip('/')
+        if parsed.query:
+            key += '?' + parsed.query
+        return key
+    
+    def _reset_zotero_index(self):
+        """Clear the per-item arrays and lookup indexes."""
+        # One entry per Zotero item, addressed by the same integer index
+        self._zot_ids: List[str] = []
+        self._zot_titles: List[str] = []
+        self._zot_norm_titles: List[str] = []
+        self._zot_urls: List[str] = []
+        # Title lengths and n-gram signatures, built on demand by _title_arrays()
+        self._zot_lengths = np.empty(0, dtype=np.intp)
+        self._zot_sigs = np.empty(0, dtype=np.uint64)
+        self._token_index: Dict[str, Set[int]] = {}
+        self._url_index: Dict[str, Set[int]] = {}
+    
+    def _add_zotero_item(self, key: str, title: str, url: str):
+        """Append one Zotero item to the arrays and add it to the token and URL indexes."""
+        index = len(self._zot_ids)
+        norm_title = self.normalize_title(title)
+        
+        self._zot_ids.append(key)
+        self._zot_titles.append(title)
+        self._zot_norm_titles.append(norm_title)
+        self._zot_urls.append(url)
+        
+        for token in set(norm_title.split()):
+            if len(token) >= _BLOCK_TOKEN_LEN:
+                self._token_index.setdefault(token, set()).add(index)
+        if url:
+            self._url_index.setdefault(self._url_key(url), set()).add(index)
+    
+    def _zotero_item(self, index: int) -> Dict:
+        """Build the reporting view of a Zotero item."""
+        return {
+            'key': self._zot_ids[index],
+            'data': {
+                'title': self._zot_titles[index],
+                'url': self._zot_urls[index]
+            }
+        }
+    
+    def _candidate_indices(self, wiki_title: str) -> List[int]:
+        """Return the Zotero items sharing at least one indexed token with wiki_title."""
+        tokens = [token for token in wiki_title.split() if len(token) >= _BLOCK_TOKEN_LEN]
+        if not tokens:
+            # Nothing to block on, fall back to a full scan
+            return list(range(len(self._zot_norm_titles)))
+        
+        candidates = set()
+        for token in tokens:
+            candidates.update(self._token_index.get(token, ()))
+        return sorted(candidates)
+    
+    def _title_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the title lengths and n-gram signatures of all loaded items as arrays."""
+        done = len(self._zot_sigs)
+        if done != len(self._zot_norm_titles):
+            new_titles = self._zot_norm_titles[done:]
+            self._zot_lengths = np.concatenate([self._zot_lengths, np.array([len(t) for t in new_titles], dtype=np.intp)])
+            self._zot_sigs = np.concatenate([self._zot_sigs, np.array([_title_signature(t) for t in new_titles], dtype=np.uint64)])
+        return self._zot_lengths, self._zot_sigs
+    
+    def _filter_candidates(self, wiki_title: str, candidates: List[int], threshold: float) -> List[int]:
+        """Drop candidates whose titles cannot reach the threshold, without scoring them."""
+        lengths, sigs = self._title_arrays()
+        candidates = np.asarray(candidates, dtype=np.intp)
+        wiki_len = len(wiki_title)
+        zot_lens = lengths[candidates]
+        
+        # Similarity is at most 2*min(len)/(sum of lens), so lengths alone can rule a pair out
+        keep = (zot_lens > 0) & (2 * np.minimum(wiki_len, zot_lens) >= threshold * (wiki_len + zot_lens))
+        
+        # Titles with no n-gram in common are too far apart
+        keep &= np.bitwise_and(sigs[candidates], _title_signature(wiki_title)) != 0
+        
+        return candidates[keep].tolist()
+    
+    def _title_scores(self, wiki_title: str, candidates: List[int], threshold: float) -> Dict[int, float]:
+        """Return {index: similarity} for candidate titles at or above the threshold."""
+        if process is not None:
+            choices = [self._zot_norm_titles[index] for index in candidates]
+            hits = process.extract(wiki_title, choices, scorer=fuzz.ratio,
+                                   score_cutoff=threshold * 100, limit=None)
+            return {candidates[position]: score / 100.0 for _, score, position in hits}
+        
+        scores = {}
+        for index in candidates:
+            score = self.similarity_score(wiki_title, self._zot_norm_titles[index])
+            if score >= threshold:
+                scores[index] = score
+        return scores
     
     def find_matching_zotero_items(self, wikiversity_citation: Dict, threshold: float = 0.8) -> List[Dict]:
         """Find Zotero items that might match a Wikiversity citation."""
@@ -225,31 +735,36 @@ class WikiversityZoteroComparator:
         if not wiki_title:
             return matches
         
-        for item in self.zotero_items:
-            item_data = item.get('data', {})
-            zot_title = self.normalize_title(item_data.get('title', ''))
+        # Only score Zotero items that share a title token with the citation
+        candidates = self._candidate_indices(wiki_title)
+        title_candidates = self._filter_candidates(wiki_title, candidates, threshold)
+        title_hits = self._title_scores(wiki_title, title_candidates, threshold)
+        
+        # Also check URL if available: exact hits come from the index,
+        # near-identical URLs are checked among the title candidates
+        url_hits = set()
+        wiki_url = wikiversity_citation.get('url', '')
+        
+        if wiki_url:
+            url_hits.update(self._url_index.get(self._url_key(wiki_url), ()))
+            url_hits.update(index for index in candidates
+                            if self._zot_urls[index] and self.similarity_score(wiki_url, self._zot_urls[index]) > 0.9)
+        
+        for index in set(title_hits) | url_hits:
+            zot_title = self._zot_norm_titles[index]
             
             if not zot_title:
                 continue
             
-            # Compare titles
-            title_similarity = self.similarity_score(wiki_title, zot_title)
-            
-            # Also check URL if available
-            url_match = False
-            wiki_url = wikiversity_citation.get('url', '')
-            zot_url = item_data.get('url', '')
-            
-            if wiki_url and zot_url:
-                url_match = wiki_url == zot_url or self.similarity_score(wiki_url, zot_url) > 0.9
+            title_similarity = title_hits.get(index)
+            if title_similarity is None:
+                title_similarity = self.similarity_score(wiki_title, zot_title)
             
-            # Consider it a match if title similarity is high or URLs match
-            if title_similarity >= threshold or url_match:
-                matches.append({
-                    'zotero_item': item,
-                    'title_similarity': title_similarity,
-                    'url_match': url_match
-                })
+            matches.append({
+                'zotero_item': self._zotero_item(index),
+                'title_similarity': title_similarity,
+                'url_match': index in url_hits
+            })
         
         return sorted(matches, key=lambda x: x['title_similarity'], reverse=True)
     
@@ -260,7 +775,7 @@ class WikiversityZoteroComparator:
         Returns:
             Dictionary with comparison results
         """
-        if not self.zotero_items:
+        if not self._zot_ids:
             print("No Zotero items loaded. Call load_zotero_library() first.")
             return {}
         
@@ -355,6 +870,12 @@ class WikiversityZoteroComparator:
         print(f"\nMissing citations exported to {filename}")
 
 
+def _parse_page_worker(page: Tuple[str, bytes]) -> List[Dict]:
+    """Process-pool entry point: parse one fetched (url, body) page."""
+    url, body = page
+    return WikiversityZoteroComparator._parse_page(body, url)
+
+
 def main():
     """Main function to run the comparison."""
     
@@ -5,9 +5,11 @@ Enhanced Wikiversity-Zotero Citation Comparator with GitHub integration
 
 import os
 import yaml
-import json
-import csv
+import orjson
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
 from citation_comparator import WikiversityZoteroComparator
 
 def load_config():
@@ -15,6 +17,30 @@ def load_config():
     with open('config.yaml', 'r') as f:
         return yaml.safe_load(f)
 
+def compact_match(match):
+    """Reduce a match's Zotero item to its key, title and URL"""
+    item = match['zotero_item']
+    data = item.get('data', {})
+    return {**match, 'zotero_item': {'key': item.get('key'), 'title': data.get('title'), 'url': data.get('url')}}
+
+def compact_results(results):
+    """Return a copy of the results with every embedded Zotero item compacted"""
+    compact = dict(results)
+    compact['found_in_zotero'] = [
+        {**entry, 'zotero_match': compact_match(entry['zotero_match'])}
+        for entry in results.get('found_in_zotero', [])
+    ]
+    compact['potential_matches'] = [
+        {**entry, 'possible_matches': [compact_match(match) for match in entry['possible_matches']]}
+        for entry in results.get('potential_matches', [])
+    ]
+    return compact
+
+def save_json_report(results, filename='results.json'):
+    """Save the results as JSON, with Zotero items reduced to key, title and URL"""
+    data = orjson.dumps(compact_results(results), option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    Path(filename).write_bytes(data)
+
 def save_markdown_report(results, filename='report.md'):
     """Save results as a markdown report"""
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S UTC")
@@ -42,20 +68,18 @@ def save_markdown_report(results, filename='report.md'):
                     f.write(f"**Date:** {citation['date']}\n\n")
                 if citation.get('source_url'):
                     f.write(f"**Source Page:** {citation['source_url']}\n\n")
+                if citation.get('duplicates_of'):
+                    f.write(f"**Also Cited On:** {', '.join(citation['duplicates_of'])}\n\n")
                 f.write(f"**Raw Citation:**\n```\n{citation['raw_text']}\n```\n\n")
                 f.write("---\n\n")
 
 def save_csv_report(results, filename='missing_citations.csv'):
     """Save missing citations as CSV"""
-    with open(filename, 'w', newline='', encoding='utf-8') as f:
-        fieldnames = ['title', 'author', 'url', 'date', 'journal', 'source_url', 'raw_text']
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        for citation in results['missing_from_zotero']:
-            # Clean the data for CSV
-            row = {k: str(v) if v else '' for k, v in citation.items() if k in fieldnames}
-            writer.writerow(row)
+    fieldnames = ['title', 'author', 'url', 'date', 'journal', 'source_url', 'duplicates_of', 'raw_text']
+    df = pd.DataFrame(results['missing_from_zotero']).reindex(columns=fieldnames)
+    df['duplicates_of'] = df['duplicates_of'].map(lambda pages: ', '.join(pages) if isinstance(pages, list) else '')
+    df = df.fillna('')
+    df.to_csv(filename, index=False, encoding='utf-8', lineterminator='\r\n')
 
 def main():
     """Main function"""
@@ -74,41 +98,46 @@ def main():
     print("🚀 Starting Wikiversity-Zotero comparison...")
     
     # Initialize comparator
-    comparator = WikiversityZoteroComparator(zotero_user_id, zotero_api_key)
-    
-    # Load Zotero library
-    print("📚 Loading Zotero library...")
-    comparator.load_zotero_library()
-    
-    # Extract Wikiversity citations
-    print("🌐 Extracting Wikiversity citations...")
-    wikiversity_urls = config.get('wikiversity_urls', [])
-    if not wikiversity_urls:
-        print("❌ Error: No Wikiversity URLs configured")
-        return 1
-    
-    comparator.extract_wikiversity_citations(wikiversity_urls)
-    
-    # Compare citations
-    print("🔍 Comparing citations...")
-    threshold = config.get('similarity_threshold', 0.8)
-    results = comparator.compare_citations(threshold)
+    with WikiversityZoteroComparator(zotero_user_id, zotero_api_key) as comparator:
+        # Load Zotero library
+        print("📚 Loading Zotero library...")
+        comparator.load_zotero_library(config.get('zotero_cache_file'))
+        
+        # Extract Wikiversity citations
+        print("🌐 Extracting Wikiversity citations...")
+        wikiversity_urls = config.get('wikiversity_urls', [])
+        if not wikiversity_urls:
+            print("❌ Error: No Wikiversity URLs configured")
+            return 1
+        
+        comparator.extract_wikiversity_citations(wikiversity_urls)
+        
+        # Compare citations
+        print("🔍 Comparing citations...")
+        threshold = config.get('similarity_threshold', 0.8)
+        results = comparator.compare_citations(threshold)
     
     # Generate outputs
     output_formats = config.get('output_formats', ['json'])
+    writers = []
     
     if 'json' in output_formats:
         print("💾 Saving JSON report...")
-        with open('results.json', 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        writers.append(save_json_report)
     
     if 'markdown' in output_formats:
         print("📝 Saving Markdown report...")
-        save_markdown_report(results)
+        writers.append(save_markdown_report)
     
     if 'csv' in output_formats:
         print("📊 Saving CSV report...")
-        save_csv_report(results)
+        writers.append(save_csv_report)
+    
+    # The reports are independent, so write them concurrently
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(writer, results) for writer in writers]
+        for future in futures:
+            future.result()
     
     # Print summary
     summary = results['summary']